@@ -0,0 +1,596 @@
+# --- BENCHMARK ---
+# Đo hiệu năng trên một database tạm (không đụng tới instance/site.db).
+#   python benchmark.py db --writers 8 --readers 4 --seconds 5
+#   python benchmark.py dictation --seconds 3
+#   python benchmark.py http --users 200 --concurrency 8 --output after.json
+#   python benchmark.py compare before.json after.json
+#   python benchmark.py serve --workers 4 --threads 8
+# Mỗi hồ sơ DB (DB_PROFILES trong app.py) chạy trong một tiến trình riêng vì cấu hình được đọc lúc import app.
+import argparse
+import http.cookiejar
+import itertools
+import json
+import os
+import random
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RATINGS = ['hoc-lai', 'kho', 'tot', 'de']
+
+
+def scratch_db_url(directory):
+    return 'sqlite:///' + os.path.join(directory, 'bench.db')
+
+
+def import_app(database_url, profile=None, init=True):
+    # Phải đặt biến môi trường trước khi import app
+    os.environ['DATABASE_URL'] = database_url
+    if profile:
+        os.environ['DB_PROFILE'] = profile
+    sys.path.insert(0, HERE)
+    import app as app_module
+    if init:
+        with app_module.app.app_context():
+            app_module.init_db()
+    return app_module
+
+
+def login(app_module, username):
+    with app_module.app.app_context():
+        user_id = app_module.User.query.filter_by(username=username).one().id
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    return client
+
+
+def write_json(result, output):
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    print(text)
+
+
+# --- 1. GHI/ĐỌC ĐỒNG THỜI THEO HỒ SƠ DB ---
+
+def db_worker(args):
+    m = import_app(args.database_url, args.profile)
+    with m.app.app_context():
+        users = [m.User(username=f'bench{i}', email=f'bench{i}@example.com', fullname=f'Bench {i}', password='x')
+                 for i in range(args.writers + args.readers)]
+        m.db.session.add_all(users)
+        m.db.session.commit()
+        card_ids = [card.id for card in m.get_deck(1).data]
+
+    stop_at = time.perf_counter() + args.seconds
+    counters = {'writes': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def writer(i):
+        client = login(m, f'bench{i}')
+        rng = random.Random(i)
+        done = errors = 0
+        while time.perf_counter() < stop_at:
+            res = client.post('/save_progress', json={'card_id': rng.choice(card_ids), 'rating': rng.choice(RATINGS)})
+            if res.status_code == 200:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counters['writes'] += done
+            counters['errors'] += errors
+
+    def reader(i):
+        client = login(m, f'bench{args.writers + i}')
+        done = errors = 0
+        while time.perf_counter() < stop_at:
+            res = client.get('/stats')
+            if res.status_code == 200:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counters['reads'] += done
+            counters['errors'] += errors
+
+    m.app.config['PROPAGATE_EXCEPTIONS'] = False
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        'profile': args.profile,
+        'writers': args.writers,
+        'readers': args.readers,
+        'seconds': round(elapsed, 3),
+        'writes': counters['writes'],
+        'reads': counters['reads'],
+        'errors': counters['errors'],
+        'writes_per_sec': round(counters['writes'] / elapsed, 1),
+        'reads_per_sec': round(counters['reads'] / elapsed, 1),
+    }))
+
+
+def db_benchmark(args):
+    results = []
+    for profile in args.profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = [sys.executable, os.path.abspath(__file__), '_db-worker',
+                   '--profile', profile, '--database-url', scratch_db_url(tmp),
+                   '--writers', str(args.writers), '--readers', str(args.readers), '--seconds', str(args.seconds)]
+            out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    write_json({'benchmark': 'db', 'results': results}, args.output)
+
+
+# --- 2. THÔNG LƯỢNG CHẤM BÀI NGHE CHÉP ---
+
+def mutate_transcript(text, rng):
+    # Bài làm giả: bỏ, thay hoặc chèn ngẫu nhiên ~20% số từ
+    words = []
+    for word in text.split():
+        roll = rng.random()
+        if roll < 0.07:
+            continue
+        if roll < 0.14:
+            word = word[::-1]
+        words.append(word)
+        if roll > 0.94:
+            words.append('uh')
+    return ' '.join(words)
+
+
+def dictation_benchmark(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        m = import_app(scratch_db_url(tmp))
+    segments = [seg for video in m.VIDEOS_STORE.snapshot().index['segment_tokens'].values() for seg in video]
+    texts = [' '.join(seg.words) for seg in segments]
+    rng = random.Random(0)
+    attempts = [(segments[i], mutate_transcript(texts[i], rng)) for i in range(len(segments))]
+
+    scored = words = 0
+    started = time.perf_counter()
+    stop_at = started + args.seconds
+    while time.perf_counter() < stop_at:
+        for segment, transcript in attempts:
+            m.score_transcript(segment, transcript)
+            words += len(segment.norms)
+        scored += len(attempts)
+    elapsed = time.perf_counter() - started
+
+    write_json({
+        'benchmark': 'dictation',
+        'segments': len(segments),
+        'seconds': round(elapsed, 3),
+        'scored': scored,
+        'scores_per_sec': round(scored / elapsed, 1),
+        'words_per_sec': round(words / elapsed, 1),
+    }, args.output)
+
+
+# --- 3. DỮ LIỆU GIẢ LẬP ---
+# Tỉ lệ gần với dữ liệu thật: mỗi user ~3 bài, ~10% bài được chia sẻ lại, lượt like/bình luận dồn vào
+# một số ít bài nổi bật (phân phối đuôi dài), mỗi user ôn một số thẻ khác nhau.
+BENCH_PASSWORD = 'bench'
+POSTS_PER_USER = 3
+SHARE_RATIO = 0.1
+COMMENTS_PER_POST = 1.5
+
+
+def generate_data(m, users, seed=0, reviews_per_user=150):
+    rng = random.Random(seed)
+    now = datetime.now()
+    db = m.db
+    with m.app.app_context():
+        db.session.execute(db.insert(m.User), [
+            {'username': f'user{i}', 'email': f'user{i}@example.com', 'fullname': f'Người dùng {i}', 'password': BENCH_PASSWORD}
+            for i in range(users)
+        ])
+        user_ids = db.session.execute(db.select(m.User.id).order_by(m.User.id)).scalars().all()
+
+        posts = []
+        for user_id in user_ids:
+            for _ in range(int(rng.expovariate(1 / POSTS_PER_USER))):
+                posts.append({'content': f'Bài viết thử {len(posts)}', 'user_id': user_id,
+                              'date_posted': now - timedelta(minutes=rng.randint(0, 90 * 24 * 60))})
+        if posts:
+            db.session.execute(db.insert(m.Post), posts)
+        post_rows = db.session.execute(db.select(m.Post.id, m.Post.date_posted)).all()
+
+        # Độ nổi bật của bài viết (Pareto) quyết định số lượt like / bình luận / chia sẻ
+        weights = [rng.paretovariate(1.2) for _ in post_rows]
+        shares = []
+        for _ in range(int(len(post_rows) * SHARE_RATIO)):
+            original_id, posted = rng.choices(post_rows, weights)[0]
+            shares.append({'content': '', 'user_id': rng.choice(user_ids), 'original_post_id': original_id,
+                           'date_posted': min(now, posted + timedelta(hours=rng.randint(1, 72)))})
+        if shares:
+            db.session.execute(db.insert(m.Post), shares)
+
+        likes, comments = [], []
+        for (post_id, posted), weight in zip(post_rows, weights):
+            for user_id in rng.sample(user_ids, min(len(user_ids), int(weight * 2) - 1)):
+                likes.append({'user_id': user_id, 'post_id': post_id})
+            for _ in range(int(rng.expovariate(1 / (COMMENTS_PER_POST * weight)))):
+                comments.append({'content': 'Bình luận thử', 'user_id': rng.choice(user_ids), 'post_id': post_id,
+                                 'date_posted': min(now, posted + timedelta(minutes=rng.randint(1, 600)))})
+        if likes:
+            db.session.execute(db.insert(m.Like), likes)
+        if comments:
+            db.session.execute(db.insert(m.Comment), comments)
+
+        cards = [(set_id, card.id) for set_id in m.DECKS.deck_ids()
+                 for card in (m.get_deck(set_id).data if m.get_deck(set_id) else ())]
+        reviews = []
+        for user_id in user_ids:
+            for set_id, card_id in rng.sample(cards, min(len(cards), rng.randint(0, 2 * reviews_per_user))):
+                repetitions = rng.randint(0, 8)
+                interval = 0.0 if repetitions == 0 else round(rng.uniform(1, 60), 2)
+                reviews.append({'user_id': user_id, 'card_id': card_id, 'set_id': set_id,
+                                'next_review': now + timedelta(days=rng.uniform(-10, 30)),
+                                'review_count': repetitions + rng.randint(1, 3), 'ease': round(rng.uniform(1.3, 2.8), 2),
+                                'interval_days': interval, 'repetitions': repetitions, 'lapses': rng.randint(0, 2)})
+        if reviews:
+            db.session.execute(db.insert(m.FlashcardReview), reviews)
+        db.session.commit()
+        # Chèn thẳng theo lô không đi qua route -> tính lại bộ đếm XP và like/bình luận/chia sẻ
+        m.recompute_xp()
+        m.recount_post_counters()
+
+    return {'users': len(user_ids), 'posts': len(posts), 'shares': len(shares), 'likes': len(likes),
+            'comments': len(comments), 'reviews': len(reviews)}
+
+
+def seed_command(args):
+    m = import_app(args.database_url)
+    counts = generate_data(m, args.users, args.seed, args.reviews_per_user)
+    write_json({'benchmark': 'seed', 'database_url': args.database_url, 'dataset': counts}, args.output)
+
+
+# --- 4. TẢI HTTP THEO TỪNG ROUTE ---
+# Mỗi route được gọi `requests` lần bởi `concurrency` luồng (mỗi luồng đăng nhập 1 user khác nhau).
+# Số câu SQL mỗi request đọc từ header Server-Timing nên dùng được cho cả test client lẫn server thật.
+HTTP_ROUTES = {
+    'community': lambda rng, ctx: ('GET', '/community', None),
+    'leaderboard': lambda rng, ctx: ('GET', '/leaderboard', None),
+    'review': lambda rng, ctx: ('GET', '/review', None),
+    'stats': lambda rng, ctx: ('GET', '/stats', None),
+    'profile': lambda rng, ctx: ('GET', '/profile/' + rng.choice(ctx['usernames']), None),
+    'save_progress': lambda rng, ctx: ('POST', '/save_progress',
+                                       {'card_id': rng.choice(ctx['card_ids']), 'rating': rng.choice(RATINGS)}),
+}
+SERVER_TIMING_QUERIES = re.compile(r'db;desc="(\d+) queries"')
+
+
+def test_client_session(m, username):
+    client = login(m, username)
+
+    def send(method, path, body=None):
+        res = client.open(path, method=method, json=body)
+        return res.status_code, res.headers.get('Server-Timing', '')
+    return send
+
+
+def server_session(base_url, username):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    form = urllib.parse.urlencode({'username': username, 'password': BENCH_PASSWORD}).encode()
+    opener.open(base_url + '/login', form).read()
+
+    def send(method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'} if data else {})
+        try:
+            with opener.open(req) as res:
+                res.read()
+                return res.status, res.headers.get('Server-Timing', '')
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get('Server-Timing', '')
+    return send
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))]
+
+
+def run_route(route, sessions, ctx, total, warmup):
+    latencies, queries = [], []
+    errors = 0
+    lock = threading.Lock()
+    counter = itertools.count()
+    clock = []
+    # Chỉ bấm giờ khi mọi luồng đã khởi động xong. Bấm trong action= của barrier (chạy trước khi thả luồng nào):
+    # nếu luồng chính đọc giờ sau wait() thì các luồng worker có thể đã chạy xong phần lớn request.
+    ready = threading.Barrier(len(sessions), action=lambda: clock.append(time.perf_counter()))
+
+    def worker(i, send):
+        nonlocal errors
+        rng = random.Random(i)
+        for _ in range(warmup):
+            send(*route(rng, ctx))
+        ready.wait()
+        while next(counter) < total:
+            method, path, body = route(rng, ctx)
+            started = time.perf_counter()
+            status, timing = send(method, path, body)
+            elapsed = time.perf_counter() - started
+            match = SERVER_TIMING_QUERIES.search(timing)
+            with lock:
+                latencies.append(elapsed)
+                if match:
+                    queries.append(int(match.group(1)))
+                if status >= 400:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker, args=(i, send)) for i, send in enumerate(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - clock[0]
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'mean_ms': round(1000 * sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        'p50_ms': round(1000 * percentile(latencies, 50), 2),
+        'p95_ms': round(1000 * percentile(latencies, 95), 2),
+        'p99_ms': round(1000 * percentile(latencies, 99), 2),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def http_benchmark(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.base_url:
+            # Server thật phải dùng DB đã tạo bằng lệnh seed (cùng --users); app chỉ được import để đọc bộ thẻ
+            m = import_app(scratch_db_url(tmp), init=False)
+            dataset = {'users': args.users}
+            target = args.base_url.rstrip('/')
+        else:
+            m = import_app(scratch_db_url(tmp), args.profile)
+            m.app.config['PROPAGATE_EXCEPTIONS'] = False
+            dataset = generate_data(m, args.users, args.seed, args.reviews_per_user)
+            target = 'test-client'
+
+        usernames = [f'user{i}' for i in range(args.users)]
+        ctx = {'usernames': usernames, 'card_ids': [card.id for card in m.get_deck(1).data]}
+        results = {}
+        for name in args.routes:
+            sessions = [server_session(target, usernames[i % len(usernames)]) if args.base_url
+                        else test_client_session(m, usernames[i % len(usernames)])
+                        for i in range(args.concurrency)]
+            results[name] = run_route(HTTP_ROUTES[name], sessions, ctx, args.requests, args.warmup)
+
+    write_json({
+        'benchmark': 'http',
+        'target': target,
+        'profile': os.environ.get('DB_PROFILE'),
+        'concurrency': args.concurrency,
+        'requests_per_route': args.requests,
+        'dataset': dataset,
+        'routes': results,
+    }, args.output)
+
+
+def compare_command(args):
+    # So sánh 2 file kết quả http; thoát mã 1 nếu p95 của route nào chậm đi quá ngưỡng (%)
+    with open(args.baseline, encoding='utf-8') as f:
+        before = json.load(f)['routes']
+    with open(args.current, encoding='utf-8') as f:
+        after = json.load(f)['routes']
+    regressions = []
+    print(f"{'route':<16}{'p95 trước':>12}{'p95 sau':>12}{'thay đổi':>10}{'rps trước':>12}{'rps sau':>10}")
+    for name in sorted(set(before) & set(after)):
+        old, new = before[name], after[name]
+        change = 100 * (new['p95_ms'] - old['p95_ms']) / old['p95_ms'] if old['p95_ms'] else 0.0
+        print(f"{name:<16}{old['p95_ms']:>12}{new['p95_ms']:>12}{change:>9.1f}%"
+              f"{old['requests_per_sec']:>12}{new['requests_per_sec']:>10}")
+        if change > args.threshold:
+            regressions.append(name)
+    if regressions:
+        print('Chậm đi:', ', '.join(regressions))
+        sys.exit(1)
+
+
+# --- 5. KHỞI ĐỘNG SERVER PRODUCTION (serve.py) ---
+# Thời gian từ lúc chạy lệnh tới khi /ready trả 200 (cold start) và bộ nhớ của từng tiến trình sau khi có tải.
+# PSS chia đều các trang dùng chung cho những tiến trình cùng dùng -> tổng PSS là bộ nhớ thật của cả server.
+MEMORY_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def process_memory(pid):
+    # Số liệu (MB) từ /proc/<pid>/smaps_rollup (Linux >= 4.14)
+    memory = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in MEMORY_FIELDS:
+                memory[key.lower() + '_mb'] = round(int(value.split()[0]) / 1024, 1)
+    return memory
+
+
+def child_pids(pid):
+    children = []
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # Trường thứ 4 là PPID; tên tiến trình (trường 2) có thể chứa dấu cách nên tách sau dấu ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(name))
+    return sorted(children)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(base_url, proc, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f'serve.py đã dừng (mã {proc.returncode}) trước khi sẵn sàng')
+        try:
+            with urllib.request.urlopen(base_url + '/ready', timeout=1) as res:
+                if res.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.02)
+    raise SystemExit(f'/ready không trả 200 sau {timeout}s')
+
+
+def serve_benchmark(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = scratch_db_url(tmp)
+        m = import_app(database_url)
+        dataset = generate_data(m, args.users, args.seed, args.reviews_per_user)
+
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        env = dict(os.environ, DATABASE_URL=database_url)
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, os.path.join(HERE, 'serve.py'), '--port', str(port),
+                                 '--workers', str(args.workers), '--threads', str(args.threads)],
+                                cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(base_url, proc, args.timeout)
+            cold_start = time.perf_counter() - started
+
+            usernames = [f'user{i}' for i in range(args.users)]
+            ctx = {'usernames': usernames, 'card_ids': [card.id for card in m.get_deck(1).data]}
+            results = {}
+            for name in args.routes:
+                sessions = [server_session(base_url, usernames[i % len(usernames)]) for i in range(args.concurrency)]
+                results[name] = run_route(HTTP_ROUTES[name], sessions, ctx, args.requests, args.warmup)
+
+            # Đo sau khi có tải: trang nhớ của cha chỉ bị sao chép khi worker ghi vào
+            processes = {'master': process_memory(proc.pid)}
+            workers = child_pids(proc.pid)
+            for i, pid in enumerate(workers):
+                processes[f'worker{i}'] = process_memory(pid)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    per_worker = [processes[f'worker{i}'] for i in range(len(workers))] or [processes['master']]
+    write_json({
+        'benchmark': 'serve',
+        'workers': args.workers,
+        'threads': args.threads,
+        'cold_start_seconds': round(cold_start, 3),
+        'dataset': dataset,
+        'memory': {
+            'total_pss_mb': round(sum(p.get('pss_mb', 0) for p in processes.values()), 1),
+            'worker_private_mb': round(sum(p.get('private_dirty_mb', 0) + p.get('private_clean_mb', 0)
+                                           for p in per_worker) / len(per_worker), 1),
+            'processes': processes,
+        },
+        'routes': results,
+    }, args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark hiệu năng ứng dụng')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('db', help='Thông lượng ghi/đọc đồng thời theo từng hồ sơ DB')
+    p.add_argument('--profiles', nargs='+', default=['development', 'production'])
+    p.add_argument('--writers', type=int, default=8)
+    p.add_argument('--readers', type=int, default=4)
+    p.add_argument('--seconds', type=float, default=5)
+    p.add_argument('--output', help='Ghi kết quả JSON ra file')
+    p.set_defaults(func=db_benchmark)
+
+    p = sub.add_parser('dictation', help='Số bài nghe chép chấm được mỗi giây')
+    p.add_argument('--seconds', type=float, default=3)
+    p.add_argument('--output', help='Ghi kết quả JSON ra file')
+    p.set_defaults(func=dictation_benchmark)
+
+    p = sub.add_parser('seed', help='Tạo dữ liệu giả lập vào một database')
+    p.add_argument('--database-url', required=True, help='vd: sqlite:////tmp/bench.db')
+    p.add_argument('--users', type=int, default=200)
+    p.add_argument('--reviews-per-user', type=int, default=150)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--output', help='Ghi kết quả JSON ra file')
+    p.set_defaults(func=seed_command)
+
+    p = sub.add_parser('http', help='Độ trễ p50/p95/p99, RPS và số câu SQL của từng route')
+    p.add_argument('--routes', nargs='+', default=list(HTTP_ROUTES), choices=list(HTTP_ROUTES))
+    p.add_argument('--users', type=int, default=200)
+    p.add_argument('--reviews-per-user', type=int, default=150)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--concurrency', type=int, default=8)
+    p.add_argument('--requests', type=int, default=200, help='Số request đo cho mỗi route')
+    p.add_argument('--warmup', type=int, default=2, help='Số request khởi động mỗi luồng (không tính)')
+    p.add_argument('--profile', default='production', help='Hồ sơ DB khi chạy bằng test client')
+    p.add_argument('--base-url', help='Đo server đang chạy (DB đã tạo bằng lệnh seed) thay vì test client')
+    p.add_argument('--output', help='Ghi kết quả JSON ra file')
+    p.set_defaults(func=http_benchmark)
+
+    p = sub.add_parser('compare', help='So sánh 2 file kết quả http')
+    p.add_argument('baseline')
+    p.add_argument('current')
+    p.add_argument('--threshold', type=float, default=10, help='Ngưỡng chậm đi của p95 (%%)')
+    p.set_defaults(func=compare_command)
+
+    p = sub.add_parser('serve', help='Cold start và bộ nhớ mỗi worker của serve.py')
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--threads', type=int, default=8)
+    p.add_argument('--routes', nargs='+', default=['community', 'review', 'stats'], choices=list(HTTP_ROUTES))
+    p.add_argument('--users', type=int, default=200)
+    p.add_argument('--reviews-per-user', type=int, default=150)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--concurrency', type=int, default=8)
+    p.add_argument('--requests', type=int, default=200, help='Số request đo cho mỗi route')
+    p.add_argument('--warmup', type=int, default=2, help='Số request khởi động mỗi luồng (không tính)')
+    p.add_argument('--timeout', type=float, default=60, help='Thời gian chờ tối đa tới khi /ready trả 200')
+    p.add_argument('--output', help='Ghi kết quả JSON ra file')
+    p.set_defaults(func=serve_benchmark)
+
+    p = sub.add_parser('_db-worker')  # Dùng nội bộ bởi lệnh db
+    p.add_argument('--profile', required=True)
+    p.add_argument('--database-url', required=True)
+    p.add_argument('--writers', type=int, required=True)
+    p.add_argument('--readers', type=int, required=True)
+    p.add_argument('--seconds', type=float, required=True)
+    p.set_defaults(func=db_worker)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+# --- BỘ LẬP LỊCH ÔN TẬP (SRS) ---
+# Mỗi thẻ có trạng thái (ease, interval_days, repetitions, lapses). Bộ lập lịch nhận trạng thái cũ
+# và đánh giá của người học, trả về trạng thái mới cùng thời điểm ôn tập tiếp theo.
+# Các hàm *_batch / plan_queue / forecast_workload xử lý cả hàng đợi một lúc bằng phép toán mảng
+# (NumPy nếu có, không có thì chạy bằng Python thuần).
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # NumPy là tùy chọn
+    np = None
+
+# Đánh giá trên giao diện -> điểm chất lượng 0..5 của SM-2
+RATING_GRADES = {'hoc-lai': 1, 'kho': 3, 'tot': 4, 'de': 5}
+DEFAULT_GRADE = 0
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+RELEARN_STEP = timedelta(minutes=10)  # Quên thẻ -> học lại sau 10 phút
+MATURE_DAYS = 21                       # Khoảng cách >= 21 ngày coi như đã thuộc
+_EPOCH = datetime(1970, 1, 1)
+
+
+class CardState:
+    __slots__ = ('ease', 'interval_days', 'repetitions', 'lapses')
+
+    def __init__(self, ease=DEFAULT_EASE, interval_days=0.0, repetitions=0, lapses=0):
+        self.ease = ease
+        self.interval_days = interval_days
+        self.repetitions = repetitions
+        self.lapses = lapses
+
+    @classmethod
+    def from_row(cls, row):
+        if row is None:
+            return cls()
+        return cls(row.ease, row.interval_days, row.repetitions, row.lapses)
+
+    def as_dict(self):
+        return {
+            'ease': self.ease,
+            'interval_days': self.interval_days,
+            'repetitions': self.repetitions,
+            'lapses': self.lapses,
+        }
+
+
+class FixedIntervalScheduler:
+    # Lịch cũ của ứng dụng: 10 phút / 1 / 3 / 5 ngày, không phụ thuộc lịch sử
+    name = 'fixed'
+    INTERVALS = {'hoc-lai': RELEARN_STEP, 'kho': timedelta(days=1), 'tot': timedelta(days=3), 'de': timedelta(days=5)}
+
+    def schedule(self, state, rating, now):
+        delay = self.INTERVALS.get(rating, timedelta(0))
+        failed = rating == 'hoc-lai'
+        new_state = CardState(
+            state.ease,
+            delay.total_seconds() / 86400,
+            0 if failed else state.repetitions + 1,
+            state.lapses + (1 if failed and state.repetitions > 0 else 0),
+        )
+        return new_state, now + delay
+
+
+class SM2Scheduler:
+    # Thuật toán SuperMemo-2: khoảng cách nhân theo hệ số dễ (ease) của từng thẻ
+    name = 'sm2'
+
+    @staticmethod
+    def next_ease(ease, grade):
+        ease = ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+        return max(MIN_EASE, ease)
+
+    def schedule(self, state, rating, now):
+        grade = RATING_GRADES.get(rating, DEFAULT_GRADE)
+        if grade < 3:
+            # Quên: về lại bước học lại, tính 1 lần quên nếu thẻ đã từng nhớ
+            new_state = CardState(
+                self.next_ease(state.ease, grade) if state.repetitions > 0 else state.ease,
+                0.0,
+                0,
+                state.lapses + (1 if state.repetitions > 0 else 0),
+            )
+            return new_state, now + RELEARN_STEP
+
+        if state.repetitions == 0:
+            interval = 1.0
+        elif state.repetitions == 1:
+            interval = 6.0
+        else:
+            interval = state.interval_days * state.ease
+        if grade == 3:
+            # "Khó": giữ khoảng cách ngắn hơn một chút
+            interval = max(1.0, interval * 0.8)
+
+        new_state = CardState(self.next_ease(state.ease, grade), interval, state.repetitions + 1, state.lapses)
+        return new_state, now + timedelta(days=interval)
+
+
+SCHEDULERS = {
+    FixedIntervalScheduler.name: FixedIntervalScheduler,
+    SM2Scheduler.name: SM2Scheduler,
+}
+
+
+def get_scheduler(name):
+    try:
+        return SCHEDULERS[name]()
+    except KeyError:
+        raise ValueError(f"Không có bộ lập lịch '{name}'. Chọn một trong: {', '.join(SCHEDULERS)}")
+
+
+# --- XỬ LÝ THEO LÔ (VECTOR HÓA) ---
+
+def _as_array(values, dtype):
+    return np.asarray(values, dtype=dtype)
+
+
+def sm2_batch(eases, intervals, repetitions, grades):
+    # Áp dụng SM-2 cho cả mảng thẻ một lúc; trả về (eases, intervals, repetitions, lapsed_mask)
+    if np is None:
+        results = [_sm2_scalar(e, i, r, g) for e, i, r, g in zip(eases, intervals, repetitions, grades)]
+        return tuple(list(col) for col in zip(*results)) if results else ([], [], [], [])
+
+    eases = _as_array(eases, float)
+    intervals = _as_array(intervals, float)
+    repetitions = _as_array(repetitions, int)
+    grades = _as_array(grades, int)
+
+    passed = grades >= 3
+    q = 5 - grades
+    new_eases = np.maximum(MIN_EASE, eases + 0.1 - q * (0.08 + q * 0.02))
+    new_eases = np.where(passed | (repetitions > 0), new_eases, eases)
+
+    new_intervals = np.select(
+        [repetitions == 0, repetitions == 1],
+        [1.0, 6.0],
+        default=intervals * eases,
+    )
+    new_intervals = np.where(grades == 3, np.maximum(1.0, new_intervals * 0.8), new_intervals)
+    new_intervals = np.where(passed, new_intervals, 0.0)
+    lapsed = ~passed & (repetitions > 0)
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+    return new_eases, new_intervals, new_repetitions, lapsed
+
+
+def _sm2_scalar(ease, interval, repetitions, grade):
+    state, _ = SM2Scheduler().schedule(CardState(ease, interval, repetitions), _rating_for(grade), _EPOCH)
+    return state.ease, state.interval_days, state.repetitions, grade < 3 and repetitions > 0
+
+
+def _rating_for(grade):
+    for rating, value in RATING_GRADES.items():
+        if value == grade:
+            return rating
+    return None
+
+
+def plan_queue(due_in_days, intervals, limit=None):
+    # Sắp hàng đợi ôn tập của 1 user: chỉ lấy thẻ đã đến hạn (due_in_days <= 0),
+    # thẻ quá hạn nhiều nhất so với khoảng cách của nó được ôn trước. Trả về danh sách vị trí.
+    if np is None:
+        order = [i for i, due in enumerate(due_in_days) if due <= 0]
+        order.sort(key=lambda i: due_in_days[i] / max(intervals[i], 1.0))
+        return order[:limit] if limit else order
+
+    due_in_days = _as_array(due_in_days, float)
+    intervals = _as_array(intervals, float)
+    due_idx = np.flatnonzero(due_in_days <= 0)
+    overdue_ratio = due_in_days[due_idx] / np.maximum(intervals[due_idx], 1.0)
+    order = due_idx[np.argsort(overdue_ratio, kind='stable')]
+    if limit:
+        order = order[:limit]
+    return order.tolist()
+
+
+def forecast_workload(due_in_days, eases, intervals, repetitions, days=30, grade=RATING_GRADES['tot']):
+    # Dự báo số thẻ phải ôn mỗi ngày trong `days` ngày tới, giả định mọi lượt ôn đều đạt `grade`.
+    # Đầu vào có thể là thẻ của cả một nhóm người học (nối các mảng lại với nhau).
+    if np is None:
+        return _forecast_python(list(due_in_days), list(eases), list(intervals), list(repetitions), days, grade)
+
+    due = _as_array(due_in_days, float).copy()
+    eases = _as_array(eases, float).copy()
+    intervals = _as_array(intervals, float).copy()
+    repetitions = _as_array(repetitions, int).copy()
+    workload = np.zeros(days, dtype=int)
+    for day in range(days):
+        mask = due < day + 1
+        count = int(mask.sum())
+        workload[day] = count
+        if not count:
+            continue
+        grades = np.full(count, grade)
+        new_e, new_i, new_r, _ = sm2_batch(eases[mask], intervals[mask], repetitions[mask], grades)
+        eases[mask], intervals[mask], repetitions[mask] = new_e, new_i, new_r
+        # Thẻ quên (interval 0) quay lại vào ngày hôm sau
+        due[mask] = day + np.maximum(new_i, 1.0)
+    return workload.tolist()
+
+
+def _forecast_python(due, eases, intervals, repetitions, days, grade):
+    workload = [0] * days
+    for day in range(days):
+        for i in range(len(due)):
+            if due[i] >= day + 1:
+                continue
+            workload[day] += 1
+            eases[i], intervals[i], repetitions[i], _ = _sm2_scalar(eases[i], intervals[i], repetitions[i], grade)
+            due[i] = day + max(intervals[i], 1.0)
+    return workload
+
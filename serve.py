@@ -0,0 +1,162 @@
+# --- CHẠY PRODUCTION ---
+# Tiến trình cha import app, tạo bảng và nạp sẵn nội dung + cache (app.warm_up) rồi mới mở cổng và fork
+# các worker: mọi worker dùng chung các trang bộ nhớ đã nạp theo cơ chế copy-on-write thay vì tự parse lại.
+#   python serve.py --host 0.0.0.0 --port 8000 --workers 4 --threads 8
+# --workers 0: chạy trong chính tiến trình này, không fork (Windows không có fork).
+# Worker chết sẽ được tạo lại; SIGTERM/Ctrl+C dừng tất cả. Kiểm tra sẵn sàng: GET /ready
+# WRITE_BEHIND=1 chỉ chạy được với 1 worker: hàng đợi ghi trễ và token read-your-writes nằm trong bộ nhớ
+# của từng tiến trình, request đọc rơi vào worker khác sẽ không thấy bản ghi chưa áp dụng.
+# Nhiều worker: số liệu /metrics được gộp qua METRICS_DIR (mặc định instance/metrics, xóa mỗi lần khởi động).
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    # Số luồng xử lý cố định (server threaded của werkzeug tạo 1 luồng mới cho mỗi kết nối)
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd=None):
+        super().__init__(host, port, app, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        # BaseWSGIServer.__init__ cũng gọi server_close() (khi nhận fd) trước khi có pool
+        if hasattr(self, 'pool'):
+            self.pool.shutdown(wait=True)
+        super().server_close()
+
+
+def preload(app_module):
+    with app_module.app.app_context():
+        app_module.warm_up()
+        # Kết nối DB không được dùng chung qua fork -> mỗi worker tự mở pool mới
+        app_module.db.engine.dispose()
+    # Tiến trình cha đã chạy lại log ghi trễ cũ; từ đây worker tự mở lại log và luồng nền
+    app_module.WRITE_BEHIND.stop()
+    # Đối tượng đã nạp không bị GC quét nữa -> GC của worker không làm bẩn các trang nhớ dùng chung
+    gc.collect()
+    gc.freeze()
+    return app_module
+
+
+def run_worker(app_module, sock, threads):
+    write_behind = app_module.WRITE_BEHIND
+    write_behind.after_fork()
+    if write_behind.enabled:
+        write_behind.start()
+
+    server = PooledWSGIServer(*sock.getsockname()[:2], app_module.app, threads, fd=sock.fileno())
+    # Các worker cùng chờ trên 1 socket: worker thua khi tranh accept() nhận BlockingIOError thay vì bị treo
+    server.socket.setblocking(False)
+
+    def stop(signum, frame):
+        # shutdown() phải gọi từ luồng khác luồng đang chạy serve_forever()
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        write_behind.stop()
+
+
+def spawn(app_module, sock, threads, index):
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 0
+    try:
+        run_worker(app_module, sock, threads)
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        code = 1
+    finally:
+        # Không chạy atexit/cleanup của tiến trình cha trong tiến trình con
+        os._exit(code)
+
+
+def supervise(app_module, sock, workers, threads):
+    children = {spawn(app_module, sock, threads, i): i for i in range(workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            print(f">>> Worker {index} (pid {pid}) đã dừng (mã {os.waitstatus_to_exitcode(status)}), khởi động lại")
+            time.sleep(1)
+            children[spawn(app_module, sock, threads, index)] = index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Chạy ứng dụng ở chế độ production')
+    parser.add_argument('--host', default=os.environ.get('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1)),
+                        help='Số tiến trình worker (0 = không fork)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 8)),
+                        help='Số luồng xử lý request mỗi worker')
+    parser.add_argument('--backlog', type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    import app as app_module
+    if app_module.WRITE_BEHIND.enabled and args.workers > 1:
+        parser.error('WRITE_BEHIND=1 cần --workers 1 (hoặc 0): hàng đợi ghi trễ không dùng chung được giữa các worker')
+    if args.workers > 1 and hasattr(os, 'fork'):
+        # Mỗi worker đếm riêng -> gộp qua thư mục chung để /metrics ở worker nào cũng ra số của cả server
+        app_module.METRICS.use_directory(app_module.app.config['METRICS_DIR']
+                                         or os.path.join(app_module.app.instance_path, 'metrics'))
+    preload(app_module)
+    # Chỉ mở cổng sau khi đã sẵn sàng -> không có request nào tới trước khi warm-up xong
+    sock = socket.create_server((args.host, args.port), backlog=args.backlog)
+    sock.set_inheritable(True)
+    print(f">>> Sẵn sàng sau {time.perf_counter() - started:.2f}s: {max(args.workers, 1)} worker x {args.threads} luồng "
+          f"tại http://{args.host}:{args.port}", flush=True)
+
+    if args.workers <= 0 or not hasattr(os, 'fork'):
+        run_worker(app_module, sock, args.threads)
+    else:
+        supervise(app_module, sock, args.workers, args.threads)
+    sock.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
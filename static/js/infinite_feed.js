@@ -0,0 +1,39 @@
+// Cuộn vô hạn cho bảng tin: khi tới cuối trang thì gọi API lấy trang kế tiếp theo cursor
+(function () {
+    const sentinel = document.getElementById('feedSentinel');
+    const container = document.getElementById('feedPosts');
+    if (!sentinel || !container) return;
+
+    let nextCursor = sentinel.dataset.nextCursor;
+    const feedUrl = sentinel.dataset.feedUrl;
+    let loading = false;
+
+    function loadMore() {
+        if (loading || !nextCursor) return;
+        loading = true;
+
+        fetch(feedUrl + '?cursor=' + encodeURIComponent(nextCursor))
+            .then(res => res.json())
+            .then(data => {
+                if (data.status !== 'success') throw new Error(data.message);
+                container.insertAdjacentHTML('beforeend', data.html);
+                nextCursor = data.next_cursor;
+                if (!nextCursor) {
+                    sentinel.classList.add('d-none');
+                    observer.disconnect();
+                } else {
+                    // Quan sát lại để tải tiếp nếu trang vẫn chưa đủ dài
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
+                }
+            })
+            .catch(err => console.error('Không tải được bài viết:', err))
+            .finally(() => { loading = false; });
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMore();
+    }, { rootMargin: '400px' });
+
+    if (nextCursor) observer.observe(sentinel);
+})();
@@ -0,0 +1,110 @@
+// Hàng đợi đánh giá SRS phía client: gom các lượt đánh giá và vị trí thẻ,
+// lưu tạm vào localStorage (không mất khi rớt mạng / đóng tab) rồi gửi theo lô tới /save_progress_batch.
+(function (window) {
+    const STORAGE_KEY = 'srsReviewQueue';
+    const FLUSH_INTERVAL = 5000;   // Gửi định kỳ mỗi 5 giây
+    const MAX_BATCH = 20;          // Đủ 20 sự kiện thì gửi ngay
+    const MAX_BACKOFF = 60000;     // Gửi lỗi -> thử lại, giãn dần tối đa 60 giây
+
+    // Nhiều tab dùng chung 1 khóa localStorage -> luôn đọc lại trước khi sửa/gửi, không giữ bản sao riêng của tab.
+    // Mỗi sự kiện có id: nếu 2 tab cùng gửi 1 sự kiện thì server chỉ áp dụng 1 lần.
+    let memoryState = { events: [], progress: {} };   // Dự phòng khi không dùng được localStorage
+    let inFlight = false;
+    let retryDelay = FLUSH_INTERVAL;
+    let nextAttempt = 0;
+
+    function load() {
+        try {
+            const saved = JSON.parse(localStorage.getItem(STORAGE_KEY));
+            if (saved && Array.isArray(saved.events)) return saved;
+        } catch (e) { /* Dữ liệu hỏng -> bỏ qua */ }
+        return memoryState;
+    }
+
+    function update(change) {
+        const state = load();
+        change(state);
+        memoryState = state;
+        try {
+            localStorage.setItem(STORAGE_KEY, JSON.stringify(state));
+        } catch (e) { /* Hết dung lượng / chế độ ẩn danh -> vẫn giữ trong bộ nhớ */ }
+        return state;
+    }
+
+    function isEmpty(state) {
+        return state.events.length === 0 && Object.keys(state.progress).length === 0;
+    }
+
+    function newEventId() {
+        return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2, 12);
+    }
+
+    function flush(options) {
+        const keepalive = !!(options && options.keepalive);
+        let state = load();
+        if (inFlight || isEmpty(state)) return Promise.resolve();
+        if (!keepalive && Date.now() < nextAttempt) return Promise.resolve();
+        if (state.events.some(event => !event.id)) {
+            // Sự kiện còn tồn từ phiên bản cũ chưa có id
+            state = update(current => current.events.forEach(event => { if (!event.id) event.id = newEventId(); }));
+        }
+
+        // Chụp lại những gì đang gửi; sự kiện mới phát sinh trong lúc chờ (ở tab này hay tab khác) vẫn nằm lại hàng đợi
+        const events = state.events.slice(0, 500);
+        const progress = Object.assign({}, state.progress);
+        const body = JSON.stringify({
+            events: events,
+            progress: Object.keys(progress).map(setId => ({ set_id: Number(setId), current_index: progress[setId] }))
+        });
+
+        inFlight = true;
+        return fetch('/save_progress_batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: body,
+            keepalive: keepalive
+        })
+            .then(res => {
+                if (!res.ok) throw new Error('HTTP ' + res.status);
+                const sent = new Set(events.map(event => event.id));
+                update(current => {
+                    current.events = current.events.filter(event => !sent.has(event.id));
+                    Object.keys(progress).forEach(setId => {
+                        if (current.progress[setId] === progress[setId]) delete current.progress[setId];
+                    });
+                });
+                retryDelay = FLUSH_INTERVAL;
+                nextAttempt = 0;
+            })
+            .catch(err => {
+                console.warn('Chưa gửi được tiến độ, sẽ thử lại:', err);
+                nextAttempt = Date.now() + retryDelay;
+                retryDelay = Math.min(retryDelay * 2, MAX_BACKOFF);
+            })
+            .finally(() => { inFlight = false; });
+    }
+
+    function rate(cardId, rating, setId) {
+        const state = update(current => {
+            current.events.push({ id: newEventId(), card_id: cardId, set_id: setId || 1, rating: rating, client_ts: Date.now() });
+        });
+        if (state.events.length >= MAX_BATCH) flush();
+    }
+
+    function setProgress(setId, index) {
+        // Chỉ giữ vị trí mới nhất của mỗi bộ thẻ
+        update(current => { current.progress[setId] = index; });
+    }
+
+    setInterval(flush, FLUSH_INTERVAL);
+    window.addEventListener('online', () => { nextAttempt = 0; flush(); });
+    window.addEventListener('pagehide', () => flush({ keepalive: true }));
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flush({ keepalive: true });
+    });
+
+    // Gửi nốt phần còn tồn từ lần trước (vd: mất mạng khi đang học)
+    flush();
+
+    window.ReviewQueue = { rate: rate, setProgress: setProgress, flush: flush };
+})(window);
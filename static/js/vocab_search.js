@@ -0,0 +1,54 @@
+// Ô tìm kiếm từ vựng: gọi API ở mỗi phím gõ, hủy request cũ nếu người dùng gõ tiếp
+(function () {
+    const input = document.getElementById('vocabSearch');
+    const box = document.getElementById('vocabSearchResults');
+    if (!input || !box) return;
+
+    const searchUrl = input.dataset.searchUrl;
+    let controller = null;
+
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.innerText = text || '';
+        return div.innerHTML;
+    }
+
+    function render(results) {
+        if (!results.length) {
+            box.innerHTML = '<div class="list-group-item text-muted small">Không tìm thấy từ phù hợp.</div>';
+        } else {
+            box.innerHTML = results.map(r => `
+                <a href="${r.url}" class="list-group-item list-group-item-action d-flex justify-content-between align-items-center">
+                    <span><strong>${escapeHtml(r.word)}</strong> <span class="text-muted small">(${escapeHtml(r.type)})</span></span>
+                    <span class="text-secondary small text-truncate ms-3">${escapeHtml(r.meaning)}</span>
+                </a>`).join('');
+        }
+        box.classList.remove('d-none');
+    }
+
+    input.addEventListener('input', () => {
+        const q = input.value.trim();
+        if (controller) controller.abort();
+        if (!q) {
+            box.classList.add('d-none');
+            return;
+        }
+
+        controller = new AbortController();
+        fetch(searchUrl + '?q=' + encodeURIComponent(q), { signal: controller.signal })
+            .then(res => res.json())
+            .then(data => {
+                if (data.status === 'success' && input.value.trim() === q) render(data.results);
+            })
+            .catch(err => {
+                if (err.name !== 'AbortError') console.error('Lỗi tìm kiếm:', err);
+            });
+    });
+
+    input.addEventListener('keydown', event => {
+        if (event.key === 'Escape') box.classList.add('d-none');
+    });
+    document.addEventListener('click', event => {
+        if (!box.contains(event.target) && event.target !== input) box.classList.add('d-none');
+    });
+})();